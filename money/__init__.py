@@ -1,12 +1,59 @@
 """Implementation of Fowler's Money pattern"""
 
 from __future__ import annotations
+from array import array
+import copyreg
+from functools import lru_cache
 from math import floor
 from decimal import Decimal, ROUND_HALF_EVEN
-from re import sub
+import re
 import operator
 from babel.numbers import format_currency
 
+_NON_NUMERIC = re.compile(r'[^\d.]')
+_NON_NUMERIC_ASCII = str.maketrans("", "", "".join(
+    char for char in map(chr, range(128))
+    if not char.isdigit() and char != "."))
+
+# Money objects for common small amounts are shared, similar to small ints
+_SMALL_AMOUNT_MIN = -1000
+_SMALL_AMOUNT_MAX = 10000
+_SMALL_MONEYS = [None] * (_SMALL_AMOUNT_MAX - _SMALL_AMOUNT_MIN + 1)
+
+
+def _index(value, message: str = "Amount must be an integer") -> int:
+    """
+    Return given integer-like value as an int,
+    raising ValueError with given message if it is not one
+    """
+    try:
+        return int(operator.index(value))
+    except TypeError:
+        raise ValueError(message) from None
+
+
+@lru_cache(maxsize=4096)
+def _format_amount(amount: int, currency: str) -> str:
+    """
+    Return the locale formatted string for an amount in cents
+    """
+    return format_currency(
+        float(amount / 100),
+        currency,
+        format=None,
+        locale="en_US",
+        currency_digits=True,
+        format_type="standard")
+
+
+def _format_usd(amount: int) -> str:
+    """
+    Return the en_US formatted string for an amount of USD cents
+    """
+    sign = "-" if amount < 0 else ""
+    units, cents = divmod(abs(amount), 100)
+    return f"{sign}${units:,}.{cents:02d}"
+
 
 class Money:
     """
@@ -14,37 +61,78 @@ class Money:
     https://martinfowler.com/eaaCatalog/money.html
     """
 
+    __slots__ = ("__amount",)
+    __currency = "USD"
+
+    def __new__(cls, amount: int, *args, **kwargs):
+        if cls is not Money:
+            return object.__new__(cls)
+
+        if type(amount) is not int:
+            amount = _index(amount)
+
+        if _SMALL_AMOUNT_MIN <= amount <= _SMALL_AMOUNT_MAX:
+            index = amount - _SMALL_AMOUNT_MIN
+            money = _SMALL_MONEYS[index]
+            if money is None:
+                money = _SMALL_MONEYS[index] = cls.__create(amount)
+            return money
+
+        return cls.__create(amount)
+
     def __init__(self, amount: int):
-        self.__assert_amount(amount)
+        """
+        Validate and store the amount of a subclass instance,
+        Money itself is fully built by __new__
+        """
+        if type(self) is Money:
+            return
+
+        if type(amount) is not int:
+            amount = _index(amount)
 
         self.__amount = amount
-        self.__currency = "USD"
 
-    def instance(self, amount: int) -> Money:
+    @classmethod
+    def __create(cls, amount: int) -> Money:
         """
-        Return new money object using the given amount
+        Return new money object without validating the amount
         """
-        self.__assert_amount(amount)
+        money = object.__new__(cls)
+        money.__amount = amount
+        return money
 
-        return self.__class__(amount)
+    @classmethod
+    def instance(cls, amount: int) -> Money:
+        """
+        Return new money object using the given amount
+        """
+        return cls(amount)
 
     def __str__(self):
-        return format_currency(
-            float(self.amount / 100),
-            self.__currency,
-            format=None,
-            locale="en_US",
-            currency_digits=True,
-            format_type="standard")
+        if self.__currency == "USD":
+            return _format_usd(self.__amount)
+        return _format_amount(self.__amount, self.__currency)
+
+    def __reduce__(self):
+        """
+        Return pickling data for a money object, restoring
+        subclass instances without calling their __init__
+        """
+        if type(self) is Money:
+            return Money, (self.__amount,)
+
+        state = (getattr(self, "__dict__", None),
+                 {"_Money__amount": self.__amount})
+        return copyreg.__newobj__, (type(self), self.__amount), state
 
     @staticmethod
     def from_float(amount: float) -> Money:
         """
-        Return new money object instantiated from a float value
+        Return new money object instantiated from a float value,
+        flooring to whole cents. Ints are accepted as well and
+        non-numeric values raise a TypeError
         """
-        if not isinstance(amount, float):
-            raise ValueError("Amount must be a float")
-
         return Money(floor(amount * 100))
 
     @staticmethod
@@ -55,24 +143,26 @@ class Money:
         if not isinstance(currency_str, str):
             raise ValueError("Amount must be a string")
 
-        value = Decimal(sub(r'[^\d.]', '', currency_str))
-        return Money.from_float(float(value))
+        if currency_str.isascii():
+            cleaned = currency_str.translate(_NON_NUMERIC_ASCII)
+        else:
+            cleaned = _NON_NUMERIC.sub('', currency_str)
 
-    @staticmethod
-    def __assert_amount(amount):
-        """
-        Assert that given amount is an integer
-        """
-        if not isinstance(amount, int):
-            raise ValueError("Amount must be an integer")
+        value = Decimal(cleaned) * 100
+        return Money(int(value.to_integral_value(rounding=ROUND_HALF_EVEN)))
 
-    @staticmethod
-    def __assert_operand(operand):
+    @classmethod
+    def sum(cls, moneys) -> Money:
         """
-        Assert that given operand is a numeric type
+        Return new money object that amounts to
+        sum of all given money objects
         """
-        if not isinstance(operand, (int, float)):
-            raise ValueError("Operand must be a numeric value")
+        total = 0
+        for money in moneys:
+            if type(money) is not Money and not isinstance(money, Money):
+                raise ValueError("Operands must be money objects")
+            total += money.__amount
+        return cls(total)
 
     @property
     def amount(self) -> int:
@@ -86,11 +176,12 @@ class Money:
         Return a new money object that amounts to
         sum of this object and given money object
         """
-        if isinstance(other, Money):
-            return self.__class__(self.amount + other.amount)
+        if type(other) is Money or isinstance(other, Money):
+            return type(self)(self.__amount + other.__amount)
 
-        self.__assert_amount(other)
-        return self.__class__(self.amount + other)
+        if type(other) is not int:
+            other = _index(other)
+        return type(self)(self.__amount + other)
 
     def __radd__(self, other):
         """
@@ -104,27 +195,35 @@ class Money:
         Return a new money object that amounts to
         difference of this object and given money object
         """
-        if isinstance(other, Money):
-            return self.__class__(self.amount - other.amount)
+        if type(other) is Money or isinstance(other, Money):
+            return type(self)(self.__amount - other.__amount)
 
-        self.__assert_amount(other)
-        return self.__class__(self.amount - other)
+        if type(other) is not int:
+            other = _index(other)
+        return type(self)(self.__amount - other)
 
     def __rsub__(self, other):
         """
         Return a new money object that amounts to
         difference of this object and given money object
         """
-        return (-self).__add__(other)
+        if type(other) is not int:
+            other = _index(other)
+        return type(self)(other - self.__amount)
 
     def __mul__(self, factor: (int, float)) -> Money:
         """
         Return a new money object that amounts to
         product of this object and given money object
         """
-        self.__assert_operand(factor)
+        factor_type = type(factor)
+        if factor_type is int:
+            return type(self)(self.__amount * factor)
+
+        if factor_type is not float and not isinstance(factor, float):
+            factor = _index(factor, "Operand must be a numeric value")
 
-        return self.__class__(round(self.amount * factor))
+        return type(self)(round(self.__amount * factor))
 
     def __rmul__(self, factor) -> Money:
         """
@@ -138,41 +237,58 @@ class Money:
         Return a new money object that amounts to
         quotient of this object and given money object
         """
-        if isinstance(other, Money):
-            if other.amount == 0:
+        if type(other) is Money or isinstance(other, Money):
+            if other.__amount == 0:
                 raise ZeroDivisionError()
-            return round(self.amount / other.amount)
+            return round(self.__amount / other.__amount)
 
-        self.__assert_operand(other)
+        other_type = type(other)
+        if other_type is not int and other_type is not float \
+                and not isinstance(other, float):
+            other = _index(other, "Operand must be a numeric value")
         if other == 0:
             raise ZeroDivisionError()
-        return self.__class__(round(self.amount / other))
+        return type(self)(round(self.__amount / other))
 
     def __floordiv__(self, other) -> Money:
         """
         Return a new money object that amounts to
         quotient of this object and given money object
         """
-        if isinstance(other, Money):
-            if other.amount == 0:
+        if type(other) is Money or isinstance(other, Money):
+            if other.__amount == 0:
                 raise ZeroDivisionError()
-            return self.amount // other.amount
+            return self.__amount // other.__amount
 
-        self.__assert_operand(other)
+        other_type = type(other)
+        if other_type is not int and other_type is not float \
+                and not isinstance(other, float):
+            other = _index(other, "Operand must be a numeric value")
         if other == 0:
             raise ZeroDivisionError()
-        return self.__class__(self.amount // other)
+        return type(self)(self.__amount // other)
 
     def __eq__(self, other) -> bool:
         """
-        Check if given money object value
-        and currency matches this object
+        Check if given money object or
+        integer amount matches this object
         """
-        if isinstance(other, Money):
-            return self.amount == other.amount
+        if type(other) is Money or isinstance(other, Money):
+            return self.__amount == other.__amount
 
-        self.__assert_amount(other)
-        return self.amount == other
+        if type(other) is not int:
+            try:
+                other = _index(other)
+            except ValueError:
+                return NotImplemented
+        return self.__amount == other
+
+    def __hash__(self) -> int:
+        """
+        Return a hash of the amount, consistent
+        with equality against plain integers
+        """
+        return hash(self.__amount)
 
     def __gt__(self, other) -> bool:
         """
@@ -207,49 +323,194 @@ class Money:
         Compare object amount to given money
         amount using the provided comparison operator
         """
-        if isinstance(other, Money):
-            return comparison_operator(self.amount, other.amount)
+        if type(other) is Money or isinstance(other, Money):
+            return comparison_operator(self.__amount, other.__amount)
 
-        self.__assert_amount(other)
-        return comparison_operator(self.amount, other)
+        if type(other) is not int:
+            try:
+                other = _index(other)
+            except ValueError:
+                return NotImplemented
+        return comparison_operator(self.__amount, other)
 
     def __round__(self) -> Money:
         """
-        Return a new money object with a rounded amount
+        Return a new money object with the amount rounded
+        to whole units, rounding half to even
         """
-        decimal_value = Decimal(self.amount / 100)
-        quantized_value = decimal_value.quantize(exp=Decimal(1.00),
-                                                 rounding=ROUND_HALF_EVEN)
-        rounded = int(quantized_value)
-        return self.__class__(rounded * 100)
+        units, cents = divmod(self.__amount, 100)
+        if cents > 50 or (cents == 50 and units & 1):
+            units += 1
+        return type(self)(units * 100)
 
     def __int__(self) -> int:
         """
         Return an int representation of a money object
         """
 
-        return self.amount
+        return self.__amount
 
     def __float__(self) -> float:
         """
         Return a float representation of a money object
         """
-        return round(self.amount / 100, 2)
+        return self.__amount / 100
 
     def __neg__(self):
         """
         Return a new money object with a negative amount
         """
-        return self.__class__(-self.amount)
+        return type(self)(-self.__amount)
+
+    def __pos__(self):
+        """
+        Return this money object, as its amount is unchanged
+        """
+        return self
+
+    def __abs__(self):
+        """
+        Return a money object with an absolute value of the amount,
+        which is this object if the amount is not negative
+        """
+        if self.__amount >= 0:
+            return self
+        return type(self)(-self.__amount)
+
+
+class MutableMoney(Money):
+    """
+    Money that supports in-place arithmetic, for running totals
+    that would otherwise allocate a new object per operation
+    """
+
+    __slots__ = ()
+    __hash__ = None
+
+    def __iadd__(self, other) -> MutableMoney:
+        """
+        Add given money object or amount to this object in place
+        """
+        if isinstance(other, Money):
+            self._Money__amount += other._Money__amount
+            return self
+
+        if type(other) is not int:
+            other = _index(other)
+        self._Money__amount += other
+        return self
+
+    def __isub__(self, other) -> MutableMoney:
+        """
+        Subtract given money object or amount from this object in place
+        """
+        if isinstance(other, Money):
+            self._Money__amount -= other._Money__amount
+            return self
+
+        if type(other) is not int:
+            other = _index(other)
+        self._Money__amount -= other
+        return self
+
+    def __imul__(self, factor: (int, float)) -> MutableMoney:
+        """
+        Multiply this object by given factor in place
+        """
+        factor_type = type(factor)
+        if factor_type is int:
+            self._Money__amount *= factor
+            return self
+
+        if factor_type is not float and not isinstance(factor, float):
+            factor = _index(factor, "Operand must be a numeric value")
+        self._Money__amount = round(self._Money__amount * factor)
+        return self
 
     def __pos__(self):
         """
         Return a new money object with a positive amount
         """
-        return self.__class__(+self.amount)
+        return type(self)(self._Money__amount)
 
     def __abs__(self):
         """
         Return a new money object with an absolute value of the amount
         """
-        return self.__class__(abs(self.amount))
+        return type(self)(abs(self._Money__amount))
+
+
+class PortfolioMoney:
+    """
+    Collection of money amounts stored as a single contiguous
+    array of signed 64-bit cents rather than one object per amount.
+    Unlike Money, each amount must fit in a signed 64-bit integer
+    """
+
+    __slots__ = ("__cents",)
+
+    def __init__(self, cents=()):
+        if isinstance(cents, (bytes, bytearray, memoryview)):
+            raise ValueError("Amounts must be integers")
+
+        try:
+            self.__cents = array("q", map(operator.index, cents))
+        except TypeError:
+            raise ValueError("Amounts must be integers") from None
+        except OverflowError:
+            raise ValueError("Amounts must fit in 64 bits") from None
+
+    @classmethod
+    def from_moneys(cls, moneys) -> PortfolioMoney:
+        """
+        Return new portfolio built from the given money objects
+        """
+        try:
+            return cls(money._Money__amount for money in moneys)
+        except AttributeError:
+            raise ValueError("Operands must be money objects") from None
+
+    def __len__(self) -> int:
+        """
+        Return number of amounts in this portfolio
+        """
+        return len(self.__cents)
+
+    def __iter__(self):
+        """
+        Iterate over amounts in this portfolio as money objects
+        """
+        return map(Money, self.__cents)
+
+    def __getitem__(self, index: (int, slice)):
+        """
+        Return amount at given index as a money object,
+        or a new portfolio for a slice
+        """
+        if isinstance(index, slice):
+            return type(self)(self.__cents[index])
+        return Money(self.__cents[index])
+
+    def sum(self) -> Money:
+        """
+        Return a new money object that amounts
+        to sum of all amounts in this portfolio
+        """
+        return Money(sum(self.__cents))
+
+    def scale(self, factor: (int, float)) -> PortfolioMoney:
+        """
+        Return a new portfolio with every amount multiplied
+        by given factor, rounding like Money multiplication.
+        Amounts are multiplied one at a time in Python, this
+        only saves building a Money object per amount
+        """
+        factor_type = type(factor)
+        if factor_type is int:
+            return type(self)([cents * factor for cents in self.__cents])
+
+        if factor_type is not float and not isinstance(factor, float):
+            factor = _index(factor, "Operand must be a numeric value")
+
+        return type(self)(
+            [round(cents * factor) for cents in self.__cents])
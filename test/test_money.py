@@ -1,5 +1,8 @@
 from decimal import Decimal
-from money import Money
+import copy
+from math import floor
+import pickle
+from money import Money, MutableMoney, PortfolioMoney, _format_amount
 import pytest
 
 
@@ -7,16 +10,75 @@ def test_init_with_int():
     m = Money(1000)
     assert m.amount == 1000
 
+    assert Money.instance(1000) == m
+    assert m.instance(1000) == m
+    assert type(MutableMoney.instance(1000)) is MutableMoney
+
+    with pytest.raises(ValueError):
+        Money.instance(1000.0)
+
+
+def test_init_with_index():
+    class Cents:
+        def __index__(self):
+            return 1000
+
+    m = Money(Cents())
+    assert m.amount == 1000
+    assert type(m.amount) is int
+    assert type(Money(True).amount) is int
+    assert type(Money(1).amount) is int
+    assert Money(1) is Money(True)
+
+
+def test_index_operands():
+    class Cents:
+        def __init__(self, amount):
+            self.amount = amount
+
+        def __index__(self):
+            return self.amount
+
+    m = Money(1000)
+
+    assert m == Cents(1000)
+    assert m != Cents(999)
+    assert m > Cents(999)
+    assert m <= Cents(1000)
+    assert m + Cents(10) == Money(1010)
+    assert m - Cents(10) == Money(990)
+    assert Cents(1500) - m == Money(500)
+    assert m * Cents(3) == Money(3000)
+    assert m / Cents(3) == Money(333)
+    assert m // Cents(3) == Money(333)
+    assert PortfolioMoney([1000]).scale(Cents(2)).sum() == Money(2000)
+
+    total = MutableMoney(0)
+    total += Cents(100)
+    total -= Cents(30)
+    total *= Cents(2)
+    assert total == Money(140)
+
 
 def test_init_from_float():
     m = Money.from_float(1000.0)
     assert m.amount == 100000
 
+    assert Money.from_float(10).amount == 1000
+    assert Money.from_float(-0.015).amount == -2
+
+    with pytest.raises(TypeError):
+        Money.from_float("10.0")
+
 
 def test_init_from_string():
     m = Money.from_string("$6,150,593.22")
     assert m.amount == 615059322
 
+    assert Money.from_string("$0.29").amount == 29
+    assert Money.from_string("€1.005").amount == 100
+    assert Money.from_string("£1.015").amount == 102
+
 
 def test_init_non_int():
     with pytest.raises(ValueError):
@@ -33,6 +95,54 @@ def test_init_non_int():
         Money(m)
 
 
+def test_small_amounts_are_shared():
+    assert Money(500) is Money(500)
+    assert Money(-1000) is Money(-1000)
+    assert Money(10000) is Money(10000)
+    assert Money(10001) is not Money(10001)
+    assert Money(10001) == Money(10001)
+
+
+def test_hash():
+    assert hash(Money(1000)) == hash(Money(1000))
+    assert hash(Money(10 ** 6)) == hash(10 ** 6)
+    assert {Money(1000): "a"}[Money(1000)] == "a"
+    assert len({Money(10 ** 6), Money(10 ** 6), Money(1)}) == 2
+
+
+def test_subclass_init():
+    class LineItem(Money):
+        def __init__(self, amount, label):
+            super().__init__(amount)
+            self.label = label
+
+    item = LineItem(500, "fee")
+    assert type(item) is LineItem
+    assert item.label == "fee"
+    assert item == Money(500)
+    assert item is not Money(500)
+
+    with pytest.raises(TypeError):
+        Money(500, "fee")
+
+
+def test_subclass_init_converts_amount():
+    class Dollars(Money):
+        def __init__(self, dollars):
+            super().__init__(dollars * 100)
+
+    class Cents(Money):
+        def __init__(self, cents):
+            super().__init__(floor(cents))
+
+    assert Dollars(5).amount == 500
+    assert type(Dollars(5)) is Dollars
+    assert Cents(250.7).amount == 250
+
+    with pytest.raises(ValueError):
+        Dollars(2.5)
+
+
 def test_to_str():
     m = Money(1000)
     assert str(m) == "$10.00"
@@ -40,6 +150,15 @@ def test_to_str():
     m = Money(100000)
     assert str(m) == "$1,000.00"
 
+    assert str(Money(5)) == "$0.05"
+    assert str(Money(-123456)) == "-$1,234.56"
+    assert str(Money(0)) == "$0.00"
+
+
+def test_format_fallback():
+    assert _format_amount(-123456, "USD") == str(Money(-123456))
+    assert _format_amount(123456, "EUR") == "€1,234.56"
+
 
 def test_add():
     m = Money(1000)
@@ -52,6 +171,25 @@ def test_add():
     with pytest.raises(ValueError):
         10.0 + m
 
+    with pytest.raises(ValueError):
+        m + "10"
+
+
+def test_sum():
+    assert Money.sum([Money(1000), Money(250), Money(-50)]) == Money(1200)
+    assert Money.sum(Money(amount) for amount in range(5)) == Money(10)
+    assert Money.sum([]) == Money(0)
+
+    with pytest.raises(ValueError):
+        Money.sum([Money(1000), 10])
+
+    def broken():
+        yield Money(1000)
+        raise AttributeError("broken")
+
+    with pytest.raises(AttributeError):
+        Money.sum(broken())
+
 
 def test_subtract():
     m = Money(1000)
@@ -64,6 +202,9 @@ def test_subtract():
     with pytest.raises(ValueError):
         10.0 - m
 
+    with pytest.raises(ValueError):
+        m - "10"
+
 
 def test_multiply():
     m = Money(1000)
@@ -73,6 +214,41 @@ def test_multiply():
     assert 50.0 * m == Money(50000)
     assert m * 1.5 == Money(1500)
     assert m * 1.0009 == Money(1001)
+    assert Money(10 ** 18 + 1) * 3 == Money(3 * 10 ** 18 + 3)
+    assert m * True == m
+
+    with pytest.raises(ValueError):
+        m * "10"
+
+
+def test_mutable_in_place():
+    total = MutableMoney(1000)
+    same = total
+
+    total += 10
+    total += Money(90)
+    total -= Money(100)
+    total -= 500
+    total *= 3
+    total *= 1.5
+
+    assert total is same
+    assert total == Money(2250)
+
+    m = Money(1000)
+    original = m
+    m += 10
+    assert m is not original
+    assert original == Money(1000)
+
+    with pytest.raises(ValueError):
+        total += 10.0
+
+    with pytest.raises(ValueError):
+        total *= "3"
+
+    with pytest.raises(TypeError):
+        hash(total)
 
 
 def test_divide():
@@ -106,13 +282,22 @@ def test_comparison():
     assert m <= 1000
     assert m < 1001
 
-    with pytest.raises(ValueError):
-        assert m == 1000.0
-        assert m >= 1000.0
-        assert m >= 999.0
-        assert m > 999.0
-        assert m <= 1000.0
-        assert m < 1001.0
+    assert m != 1000.0
+    assert m != "$10.00"
+    assert 1000.0 not in [m]
+    assert m in [1000.0, m]
+
+    with pytest.raises(TypeError):
+        m >= 1000.0
+
+    with pytest.raises(TypeError):
+        m > 999.0
+
+    with pytest.raises(TypeError):
+        m <= 1000.0
+
+    with pytest.raises(TypeError):
+        m < 1001.0
 
 
 def test_sign():
@@ -123,6 +308,14 @@ def test_sign():
     assert neg == +neg
     assert abs(pos) == pos
     assert abs(neg) == pos
+    assert +pos is pos
+    assert abs(pos) is pos
+
+    total = MutableMoney(1000)
+    snapshot = +total
+    total += 10
+    assert snapshot == Money(1000)
+    assert abs(total) is not total
 
 
 def test_cast():
@@ -130,8 +323,94 @@ def test_cast():
 
     assert int(m) == 1000
     assert float(m) == 10.0
+    assert float(Money(-1234)) == -12.34
 
 
 def test_round():
     assert round(Money(1001)) == 1000
     assert round(Money(1051)) == 1100
+    assert round(Money(150)) == 200
+    assert round(Money(250)) == 200
+    assert round(Money(-150)) == -200
+    assert round(Money(-250)) == -200
+    assert round(Money(-151)) == -200
+    assert round(Money(-149)) == -100
+    assert round(Money(10 ** 20 + 50)) == 10 ** 20
+
+
+def test_pickle():
+    m = Money(1000)
+
+    assert pickle.loads(pickle.dumps(m)) == m
+    assert pickle.loads(pickle.dumps(m, protocol=0)) == m
+    assert copy.copy(m) == m
+    assert copy.deepcopy(m) == m
+
+    with pytest.raises(AttributeError):
+        m.currency = "EUR"
+
+
+class LabelledMoney(Money):
+    def __init__(self, amount, label):
+        super().__init__(amount)
+        self.label = label
+
+
+def test_pickle_subclass():
+    m = LabelledMoney(500, "fee")
+    m.note = "extra"
+
+    for copied in (pickle.loads(pickle.dumps(m)),
+                   pickle.loads(pickle.dumps(m, protocol=0)),
+                   copy.copy(m),
+                   copy.deepcopy(m)):
+        assert type(copied) is LabelledMoney
+        assert copied.amount == 500
+        assert copied.label == "fee"
+        assert copied.note == "extra"
+
+    total = MutableMoney(20000)
+    copied = copy.copy(total)
+    copied += 1
+    assert type(copied) is MutableMoney
+    assert total == Money(20000)
+
+
+def test_portfolio():
+    moneys = [Money(1000), Money(250), Money(-51)]
+    portfolio = PortfolioMoney.from_moneys(moneys)
+
+    assert len(portfolio) == 3
+    assert list(portfolio) == moneys
+    assert portfolio[1] == Money(250)
+    assert list(portfolio[1:]) == [Money(250), Money(-51)]
+    assert portfolio[::2].sum() == Money(949)
+    assert portfolio.sum() == Money(1199)
+    assert PortfolioMoney().sum() == Money(0)
+
+    assert list(portfolio.scale(2)) == [Money(2000), Money(500), Money(-102)]
+    assert list(portfolio.scale(1.5)) == [m * 1.5 for m in moneys]
+
+    with pytest.raises(ValueError):
+        PortfolioMoney([1000, 10.0])
+
+    with pytest.raises(ValueError):
+        PortfolioMoney(b"12345678")
+
+    with pytest.raises(ValueError):
+        PortfolioMoney(bytearray(8))
+
+    with pytest.raises(ValueError):
+        PortfolioMoney.from_moneys([Money(1000), 10])
+
+    with pytest.raises(ValueError):
+        PortfolioMoney.from_moneys([Money(10 ** 20)])
+
+    with pytest.raises(ValueError):
+        PortfolioMoney([2 ** 62]).scale(4)
+
+    with pytest.raises(ValueError):
+        PortfolioMoney([2 ** 62]).scale(4.0)
+
+    with pytest.raises(ValueError):
+        portfolio.scale("2")